@@ -0,0 +1,201 @@
+"""
+Admission control for upstream-bound routes
+Caps concurrent OpenWeather calls and rate-limits clients so that
+DB-only routes stay responsive when the weather service slows down
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, jsonify, request
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed because of rate limits or capacity"""
+
+    def __init__(self, message, status_code, retry_after):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Bounded number of in-flight upstream calls with a bounded wait queue"""
+
+    def __init__(self, max_concurrent=3, max_queue=2, queue_timeout=2.0, retry_after=5):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._active = 0
+        self._waiting = 0
+        self._rejected = 0
+        self._condition = threading.Condition()
+
+    def init_app(self, app):
+        """Configure limits from the application settings"""
+        self.max_concurrent = app.config.get('UPSTREAM_MAX_CONCURRENT', self.max_concurrent)
+        self.max_queue = app.config.get('UPSTREAM_MAX_QUEUE', self.max_queue)
+        self.queue_timeout = app.config.get('UPSTREAM_QUEUE_TIMEOUT', self.queue_timeout)
+        self.retry_after = app.config.get('UPSTREAM_RETRY_AFTER', self.retry_after)
+
+    def _reject(self, message):
+        self._rejected += 1
+        return AdmissionRejected(message, 503, self.retry_after)
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold one upstream slot for the duration of the block
+
+        Raises:
+            AdmissionRejected: When the wait queue is full or the wait times out
+        """
+        with self._condition:
+            if self._active >= self.max_concurrent:
+                if self._waiting >= self.max_queue:
+                    raise self._reject("Weather service busy - please try again shortly")
+                self._waiting += 1
+                try:
+                    acquired = self._condition.wait_for(
+                        lambda: self._active < self.max_concurrent,
+                        timeout=self.queue_timeout
+                    )
+                finally:
+                    self._waiting -= 1
+                if not acquired:
+                    raise self._reject("Weather service busy - please try again shortly")
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify()
+
+    def stats(self):
+        """Return a snapshot of limiter counters"""
+        with self._condition:
+            return {
+                "active": self._active,
+                "waiting": self._waiting,
+                "rejected": self._rejected,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+            }
+
+
+class RateLimiter:
+    """Per-client token buckets refilled continuously at a fixed rate"""
+
+    def __init__(self, per_minute=30, burst=10, max_clients=10000):
+        self.per_minute = per_minute
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Configure rates from the application settings"""
+        self.per_minute = app.config.get('RATE_LIMIT_PER_MINUTE', self.per_minute)
+        self.burst = app.config.get('RATE_LIMIT_BURST', self.burst)
+
+    def _prune(self, now):
+        """Forget clients whose buckets have refilled completely"""
+        rate = self.per_minute / 60.0
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if tokens + (now - updated) * rate < self.burst
+        }
+
+    def consume(self, keys):
+        """
+        Take one token from each of a request's buckets, or none at all
+
+        Args:
+            keys (list): Bucket keys, e.g. from client_keys()
+
+        Returns:
+            float: 0 when allowed, otherwise seconds until every bucket has a token
+        """
+        rate = self.per_minute / 60.0
+        now = time.monotonic()
+        with self._lock:
+            levels = {}
+            for key in keys:
+                tokens, updated = self._buckets.get(key, (self.burst, now))
+                levels[key] = min(self.burst, tokens + (now - updated) * rate)
+            retry_after = max(((1 - tokens) / rate for tokens in levels.values() if tokens < 1), default=0)
+            # A rejected request is not charged to any bucket
+            spent = 0 if retry_after else 1
+            for key, tokens in levels.items():
+                self._buckets[key] = (tokens - spent, now)
+            if len(self._buckets) > self.max_clients:
+                self._prune(now)
+            return retry_after
+
+
+upstream_limiter = ConcurrencyLimiter()
+rate_limiter = RateLimiter()
+
+
+def client_ip():
+    """
+    Address of the client that made the current request
+
+    Behind Azure Front Door the connecting address is one of Front Door's
+    shared egress IPs, so the client IP is taken from X-Azure-ClientIP, but
+    only when X-Azure-FDID proves the request came through our own profile
+    (FRONT_DOOR_ID). Otherwise this is the connecting address after ProxyFix
+    has applied PROXY_FIX_X_FOR.
+    """
+    front_door_id = current_app.config.get('FRONT_DOOR_ID')
+    if front_door_id and request.headers.get('X-Azure-FDID', '').lower() == front_door_id.lower():
+        forwarded = request.headers.get('X-Azure-ClientIP', '').strip()
+        if forwarded:
+            return forwarded
+    return request.remote_addr
+
+
+def client_keys():
+    """
+    Rate-limit buckets for the current request
+
+    Every request is charged to its client IP (see client_ip()). Form posts
+    that name a user are also charged to that user, so a name cannot be used
+    to dodge the IP bucket.
+    """
+    keys = [f"ip:{client_ip()}"]
+    user_name = (request.form.get("user_name") or "").strip().lower()
+    if user_name:
+        keys.append(f"user:{user_name}")
+    return keys
+
+
+def rate_limited(view):
+    """Decorator applying the per-client token buckets to a route"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        retry_after = rate_limiter.consume(client_keys())
+        if retry_after:
+            raise AdmissionRejected("Too many requests - please slow down", 429, retry_after)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def handle_admission_rejected(error):
+    """Fast 429/503 response with Retry-After"""
+    headers = {"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    if request.blueprint == 'api':
+        return jsonify({"error": error.message}), error.status_code, headers
+    return error.message, error.status_code, headers
+
+
+def init_admission(app):
+    """Configure limiters and register the rejection handler"""
+    upstream_limiter.init_app(app)
+    rate_limiter.init_app(app)
+    app.register_error_handler(AdmissionRejected, handle_admission_rejected)
@@ -3,8 +3,18 @@ Weather Forecast App - Main Application Factory
 """
 import os
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 from .config import getConfig
-from .models import db
+from .models import db, ensure_payload_schema
+from .cache import forecast_cache
+from .warmer import cache_warmer
+from .json_provider import FastJSONProvider
+from .compression import init_compression
+from .admission import init_admission
+from .cities import city_catalog
+from .profiling import init_profiling
+from .commands import register_commands
+from .events import broadcast_hub
 from .routes import blueprints
 
 
@@ -24,28 +34,54 @@ def create_app(config_name=None):
     # Create Flask application
     app = Flask(__name__)
     
+    # Use the fast JSON provider for jsonify and the tojson template filter
+    app.json = FastJSONProvider(app)
+    
     # Load configuration
     config_class = getConfig(config_name)
     app.config.from_object(config_class)
     config_class.init_app(app)
     
+    # Trust X-Forwarded-For from the configured number of proxies
+    if app.config.get('PROXY_FIX_X_FOR'):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+    
     # Initialize extensions
     db.init_app(app)
+    forecast_cache.init_app(app)
+    init_compression(app)
+    init_admission(app)
+    city_catalog.init_app(app)
+    init_profiling(app)
     
     # Register blueprints
     for blueprint, options in blueprints:
         app.register_blueprint(blueprint, **options)
     
+    register_commands(app)
+    
     # Create database tables
     with app.app_context():
         try:
-            db.create_all()
+            # Primary only: the read replica is never a DDL target
+            db.create_all(bind_key=None)
+            # Upgrade pre-deduplication weather_logs tables in place
+            ensure_payload_schema()
             app.logger.info("✅ Database ready")
             print("🚀 Database initialized successfully")
+        except RuntimeError:
+            # Schema the app cannot save to; refuse to start rather than fail every write
+            raise
         except Exception as e:
             app.logger.error(f"⚠️  Database init failed: {e}")
             print(f"❌ Database initialization failed: {e}")
     
+    # Live forecast stream (starts the LISTEN thread on PostgreSQL)
+    broadcast_hub.init_app(app)
+    
+    # Start background cache warming (no-op unless CACHE_WARMING_ENABLED)
+    cache_warmer.init_app(app)
+    
     return app
 
 
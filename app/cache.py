@@ -0,0 +1,108 @@
+"""
+In-memory forecast cache for the Weather Forecast App
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class ForecastCache:
+    """Thread-safe TTL cache for processed OpenWeather forecasts"""
+
+    def __init__(self, ttl=600, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Ordered oldest fill first; with one TTL that is also earliest expiry first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'warm_hits': 0,
+            'misses': 0,
+            'user_fills': 0,
+            'warmer_fills': 0,
+            'evictions': 0,
+        }
+
+    def init_app(self, app):
+        """Configure the cache from the application settings"""
+        self.ttl = app.config.get('WEATHER_CACHE_TTL', self.ttl)
+        self.max_entries = app.config.get('WEATHER_CACHE_MAX_ENTRIES', self.max_entries)
+        app.extensions['forecast_cache'] = self
+
+    @staticmethod
+    def make_key(city):
+        """Normalize a city name into a cache key"""
+        return " ".join((city or "").split()).lower()
+
+    def get(self, key):
+        """
+        Return cached forecasts for a key, or None when missing or expired
+
+        A hit on an entry filled by the cache warmer is counted as a warm hit.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['expires_at'] <= now:
+                self._stats['misses'] += 1
+                return None
+            self._stats['hits'] += 1
+            if entry['source'] == 'warmer':
+                self._stats['warm_hits'] += 1
+            return entry['forecasts']
+
+    def set(self, key, forecasts, source='user'):
+        """
+        Store forecasts for a key
+
+        Args:
+            key (str): Cache key from make_key()
+            forecasts (list): Processed forecast list
+            source (str): 'user' for request-driven fills, 'warmer' for background refreshes
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {
+                'forecasts': forecasts,
+                'expires_at': now + self.ttl,
+                'source': source,
+            }
+            self._stats[f'{source}_fills'] += 1
+            self._evict(now)
+
+    def _evict(self, now):
+        """Drop expired entries and the oldest ones beyond max_entries (lock held)"""
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if oldest['expires_at'] > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def expires_in(self, key):
+        """Seconds until the entry for a key expires (0 when missing or expired)"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return 0
+        return max(0.0, entry['expires_at'] - time.monotonic())
+
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return a snapshot of cache counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['warm_ratio'] = round(stats['warm_hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+forecast_cache = ForecastCache()
@@ -0,0 +1,165 @@
+"""
+City catalog for the Weather Forecast App
+Loads OpenWeather's bulk city list for autocomplete and city-ID resolution
+"""
+import bisect
+import gzip
+import json
+import re
+import unicodedata
+from collections import namedtuple
+
+City = namedtuple('City', ['id', 'name', 'state', 'country'])
+
+# Common abbreviations that do not appear in the OpenWeather city list
+CITY_ALIASES = {
+    'nyc': 'New York, NY, US',
+    'la': 'Los Angeles, CA, US',
+    'sf': 'San Francisco, CA, US',
+    'dc': 'Washington, DC, US',
+}
+
+# Sorts after every character that can appear in a normalized name
+_PREFIX_END = '\U0010ffff'
+
+
+def normalize_city_name(name):
+    """
+    Normalize a city name for matching
+
+    Strips accents, case and punctuation and collapses whitespace, so
+    "  São  Paulo" and "sao paulo" produce the same key.
+    """
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    without_marks = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(re.sub(r'[\W_]+', ' ', without_marks.casefold()).split())
+
+
+class CityCatalog:
+    """
+    Sorted in-memory index of known cities
+
+    Names are kept in one sorted list of normalized keys with a parallel list
+    of City tuples, so prefix search and exact lookup are both a pair of
+    binary searches.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._cities = []
+
+    @property
+    def loaded(self):
+        """True when a catalog has been loaded"""
+        return bool(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def init_app(self, app):
+        """Load the catalog configured by CITY_CATALOG_PATH, if any"""
+        app.extensions['city_catalog'] = self
+        path = app.config.get('CITY_CATALOG_PATH')
+        if not path:
+            return
+        try:
+            self.load(path)
+            app.logger.info(f"✅ Loaded {len(self)} cities from {path}")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # The catalog is optional; a bad file must not stop the app from starting
+            app.logger.error(f"⚠️  City catalog load failed: {e}")
+
+    def load(self, path):
+        """
+        Load an OpenWeather city list (city.list.json or city.list.json.gz)
+
+        Args:
+            path (str): Path to the JSON (optionally gzipped) city list
+        """
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError(f"{path} is not a JSON array of cities")
+        self.load_records(records)
+
+    def load_records(self, records):
+        """Build the index from OpenWeather city list records, skipping malformed ones"""
+        rows = []
+        for record in records:
+            try:
+                key = normalize_city_name(record.get('name'))
+                city = City(
+                    int(record['id']),
+                    record['name'],
+                    record.get('state') or '',
+                    (record.get('country') or '').upper()
+                )
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+            if not key:
+                continue
+            rows.append((key, city.id, city))
+        rows.sort(key=lambda row: (row[0], row[1]))
+        self._keys = [row[0] for row in rows]
+        self._cities = [row[2] for row in rows]
+
+    def _range(self, key, prefix):
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_right(self._keys, key + _PREFIX_END if prefix else key, lo)
+        return lo, hi
+
+    def search(self, query, limit=10):
+        """
+        Find cities whose name starts with a query
+
+        Args:
+            query (str): Partial city name
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Matching City tuples, exact matches first
+        """
+        key = normalize_city_name(query)
+        if not key:
+            return []
+        lo, hi = self._range(key, prefix=True)
+        return self._cities[lo:min(hi, lo + limit)]
+
+    @staticmethod
+    def expand_alias(query):
+        """Replace a known abbreviation (see CITY_ALIASES) with its full query"""
+        return CITY_ALIASES.get(normalize_city_name(query), query)
+
+    def _candidates(self, query):
+        """
+        Look up "Name", "Name, CC" or "Name, State, CC"
+
+        Returns:
+            tuple: (cities with that name, those also matching the qualifiers)
+        """
+        parts = [part.strip() for part in self.expand_alias(query).split(',')]
+        lo, hi = self._range(normalize_city_name(parts[0]), prefix=False)
+        named = self._cities[lo:hi]
+        qualifiers = {part.upper() for part in parts[1:] if part}
+        matched = [city for city in named if qualifiers <= {city.state.upper(), city.country}]
+        return named, matched
+
+    def resolve(self, query):
+        """
+        Resolve free-form input to a single city
+
+        Returns:
+            City: The city when exactly one catalog entry matches, otherwise None
+                  (unknown, ambiguous, or qualified in a way the catalog can't match)
+        """
+        _, matched = self._candidates(query)
+        return matched[0] if len(matched) == 1 else None
+
+    def knows(self, query):
+        """True when at least one catalog city has this name, ignoring qualifiers"""
+        named, _ = self._candidates(query)
+        return bool(named)
+
+
+city_catalog = CityCatalog()
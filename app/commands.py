@@ -0,0 +1,68 @@
+"""
+CLI commands for the Weather Forecast App
+"""
+import click
+from .models import db, ForecastPayload, WeatherLog
+
+
+def dedupe_forecasts(batch_size=500):
+    """
+    Move inline forecast JSON into shared content-addressed payloads
+
+    Returns:
+        dict: Rows migrated, payloads created and approximate bytes before/after
+    """
+    report = {'rows': 0, 'payloads_created': 0, 'bytes_before': 0, 'bytes_after': 0}
+    stored_hashes = set()
+
+    while True:
+        rows = (
+            db.session.query(WeatherLog.id, WeatherLog.legacy_weather_data)
+            .filter(WeatherLog.payload_hash.is_(None), WeatherLog.legacy_weather_data.isnot(None))
+            .order_by(WeatherLog.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        for log_id, data in rows:
+            size = len(ForecastPayload.canonical_json(data).encode("utf-8"))
+            key = ForecastPayload.hash_data(data)
+            if key not in stored_hashes:
+                if db.session.get(ForecastPayload, key) is None:
+                    db.session.add(ForecastPayload(hash=key, data=data))
+                    db.session.flush()
+                    report['payloads_created'] += 1
+                    report['bytes_after'] += size
+                stored_hashes.add(key)
+            report['bytes_before'] += size
+            db.session.query(WeatherLog).filter(WeatherLog.id == log_id).update(
+                {WeatherLog.payload_hash: key, WeatherLog.legacy_weather_data: db.null()},
+                synchronize_session=False
+            )
+            report['rows'] += 1
+
+        db.session.commit()
+
+    report['bytes_reclaimed'] = report['bytes_before'] - report['bytes_after']
+    return report
+
+
+@click.command('dedupe-forecasts')
+@click.option('--batch-size', default=500, show_default=True, help='Rows migrated per transaction.')
+def dedupe_forecasts_command(batch_size):
+    """Deduplicate saved forecast payloads (one-time migration)."""
+    report = dedupe_forecasts(batch_size=batch_size)
+    click.echo(f"✅ Migrated {report['rows']} forecasts into {report['payloads_created']} new payloads")
+    click.echo(
+        f"📦 Forecast JSON: {report['bytes_before']:,} bytes -> {report['bytes_after']:,} bytes "
+        f"({report['bytes_reclaimed']:,} bytes reclaimed)"
+    )
+    if db.engine.dialect.name == 'postgresql':
+        click.echo("ℹ️  Run VACUUM on weather_logs to return the freed space to PostgreSQL")
+
+
+def register_commands(app):
+    """Register CLI commands on the app"""
+    app.cli.add_command(dedupe_forecasts_command)
@@ -0,0 +1,67 @@
+"""
+Response compression for the Weather Forecast App
+Compresses text and JSON responses with Brotli (when installed) or gzip
+"""
+import gzip
+from flask import current_app, request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+
+def init_compression(app):
+    """Register response compression when COMPRESS_ENABLED is set"""
+    if app.config.get('COMPRESS_ENABLED'):
+        app.after_request(compress_response)
+
+
+def choose_encoding(accept_encodings):
+    """
+    Pick the best supported content encoding the client accepts
+
+    Args:
+        accept_encodings: Werkzeug Accept object from the request
+
+    Returns:
+        str: 'br', 'gzip' or None
+    """
+    if BROTLI_AVAILABLE and accept_encodings.quality('br') > 0:
+        return 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def compress_response(response):
+    """Compress a response body in place when it is large enough to benefit"""
+    config = current_app.config
+
+    if (response.direct_passthrough
+            or response.is_streamed
+            or not 200 <= response.status_code < 300
+            or response.status_code == 204
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in config.get('COMPRESS_MIMETYPES', ())):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < config.get('COMPRESS_MIN_SIZE', 500):
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding == 'br':
+        data = brotli.compress(data, quality=config.get('COMPRESS_BR_LEVEL', 4))
+    elif encoding == 'gzip':
+        data = gzip.compress(data, compresslevel=config.get('COMPRESS_LEVEL', 6))
+    else:
+        return response
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    return response
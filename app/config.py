@@ -15,6 +15,25 @@ except ImportError:
     AZURE_POSTGRES_AVAILABLE = False
 
 
+def get_replica_binds():
+    """
+    Build the optional read-replica bind
+    
+    Uses DBHOST_REPLICA (same credentials as the primary) or DATABASE_URL_REPLICA.
+    
+    Returns:
+        dict: SQLALCHEMY_BINDS entries, empty when no replica is configured
+    """
+    if AZURE_POSTGRES_AVAILABLE and os.environ.get('DBHOST_REPLICA'):
+        uri = get_connection_uri(host=os.environ['DBHOST_REPLICA'])
+    else:
+        uri = os.environ.get('DATABASE_URL_REPLICA')
+    
+    if not uri:
+        return {}
+    return {'replica': {'url': uri, 'pool_pre_ping': True}}
+
+
 class Config:
     """Base configuration class"""
     
@@ -23,6 +42,9 @@ class Config:
     
     # Database Configuration
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_BINDS = get_replica_binds()
+    READ_YOUR_WRITES_SECONDS = int(os.environ.get("READ_YOUR_WRITES_SECONDS", 10))
+    REPLICA_RETRY_SECONDS = int(os.environ.get("REPLICA_RETRY_SECONDS", 30))
     
     # API Configuration
     OPENWEATHER_API_KEY = os.environ.get("OPENWEATHER_API_KEY")
@@ -33,6 +55,56 @@ class Config:
     USER_FORECAST_LIMIT = 5
     WEATHER_API_TIMEOUT = 10
     
+    # OpenWeather bulk city list (city.list.json[.gz]) for autocomplete and
+    # city-ID resolution; unknown cities are rejected without an API call
+    CITY_CATALOG_PATH = os.environ.get("CITY_CATALOG_PATH")
+    
+    # Forecast Cache Settings
+    WEATHER_CACHE_TTL = int(os.environ.get("WEATHER_CACHE_TTL", 600))
+    WEATHER_CACHE_MAX_ENTRIES = int(os.environ.get("WEATHER_CACHE_MAX_ENTRIES", 1000))
+    CACHE_WARMING_ENABLED = os.environ.get("CACHE_WARMING_ENABLED", "0") == "1"
+    CACHE_WARM_TOP_N = int(os.environ.get("CACHE_WARM_TOP_N", 10))
+    CACHE_WARM_INTERVAL = int(os.environ.get("CACHE_WARM_INTERVAL", 30))
+    CACHE_WARM_LEAD_SECONDS = int(os.environ.get("CACHE_WARM_LEAD_SECONDS", 60))
+    CACHE_WARM_CALLS_PER_MINUTE = int(os.environ.get("CACHE_WARM_CALLS_PER_MINUTE", 20))
+    CACHE_WARM_HISTORY_HOURS = int(os.environ.get("CACHE_WARM_HISTORY_HOURS", 24))
+    
+    # Admission Control Settings (upstream-bound routes)
+    # Concurrent + queued upstream callers must stay well below gunicorn --threads
+    UPSTREAM_MAX_CONCURRENT = int(os.environ.get("UPSTREAM_MAX_CONCURRENT", 3))
+    UPSTREAM_MAX_QUEUE = int(os.environ.get("UPSTREAM_MAX_QUEUE", 2))
+    UPSTREAM_QUEUE_TIMEOUT = float(os.environ.get("UPSTREAM_QUEUE_TIMEOUT", 2))
+    UPSTREAM_RETRY_AFTER = 5
+    RATE_LIMIT_PER_MINUTE = int(os.environ.get("RATE_LIMIT_PER_MINUTE", 30))
+    RATE_LIMIT_BURST = int(os.environ.get("RATE_LIMIT_BURST", 10))
+    
+    # Trusted proxy hops in X-Forwarded-For (0 = not behind a proxy)
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 0))
+    # Azure Front Door profile ID; requests carrying it in X-Azure-FDID are keyed on X-Azure-ClientIP
+    FRONT_DOOR_ID = os.environ.get("FRONT_DOOR_ID")
+    
+    # Profiling Settings (all opt-in)
+    PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+    PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0.1))
+    PROFILE_THRESHOLD_MS = int(os.environ.get("PROFILE_THRESHOLD_MS", 500))
+    PROFILE_DIR = os.environ.get("PROFILE_DIR")
+    SLOW_QUERY_MS = int(os.environ.get("SLOW_QUERY_MS", 0))
+    SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "0") == "1"
+    
+    # Live Forecast Stream Settings (/api/stream)
+    # Each client holds a thread; counts against --threads with the upstream limits above
+    SSE_MAX_CONNECTIONS = int(os.environ.get("SSE_MAX_CONNECTIONS", 4))
+    SSE_HEARTBEAT_SECONDS = int(os.environ.get("SSE_HEARTBEAT_SECONDS", 15))
+    SSE_CLIENT_QUEUE_SIZE = 100
+    SSE_PG_NOTIFY = os.environ.get("SSE_PG_NOTIFY", "1") == "1"
+    
+    # Response Compression Settings
+    COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "1") == "1"
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 500))
+    COMPRESS_LEVEL = 6
+    COMPRESS_BR_LEVEL = 4
+    COMPRESS_MIMETYPES = ("application/json", "text/html", "text/css", "text/plain", "application/javascript")
+    
     @staticmethod
     def init_app(app):
         """Initialize app with this configuration"""
@@ -70,6 +142,9 @@ class ProductionConfig(Config):
     
     DEBUG = False
     
+    # App Service's front end always appends the connecting address
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 1))
+    
     # Production requires Azure PostgreSQL
     if AZURE_POSTGRES_AVAILABLE and os.environ.get('DBHOST'):
         try:
@@ -105,6 +180,7 @@ class TestingConfig(Config):
     
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_BINDS = {}
     WTF_CSRF_ENABLED = False
 
 
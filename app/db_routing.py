@@ -0,0 +1,106 @@
+"""
+Read-replica routing for the Weather Forecast App
+Sends read-only queries to an optional replica bind and everything else to the primary
+"""
+import threading
+import time
+from flask import current_app, has_request_context, session as http_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import UpdateBase
+from sqlalchemy.exc import DBAPIError
+
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """
+    Session that routes reads to the replica while read_from_replica() is active
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None
+                and self.info.get('use_replica')
+                and not self._flushing
+                and not isinstance(clause, UpdateBase)):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReplicaHealth:
+    """Tracks replica failures and keeps it out of rotation for a cooldown period"""
+
+    def __init__(self):
+        self._retry_at = 0.0
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    def available(self):
+        """True when the replica is not cooling down after a failure"""
+        return time.monotonic() >= self._retry_at
+
+    def mark_failed(self, cooldown):
+        """Take the replica out of rotation for cooldown seconds"""
+        with self._lock:
+            self._failures += 1
+            self._retry_at = time.monotonic() + cooldown
+
+    def status(self):
+        """Return a snapshot of replica health"""
+        return {
+            "available": self.available(),
+            "failures": self._failures,
+        }
+
+
+replica_health = ReplicaHealth()
+
+
+def pin_primary():
+    """Send this client's reads to the primary for READ_YOUR_WRITES_SECONDS after a write"""
+    window = current_app.config.get('READ_YOUR_WRITES_SECONDS', 10)
+    http_session['_primary_until'] = time.time() + window
+
+
+def _use_replica(session):
+    if REPLICA_BIND not in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        return False
+    if not replica_health.available():
+        return False
+    if session.new or session.dirty or session.deleted:
+        # Pending writes are only visible on the primary
+        return False
+    if has_request_context() and http_session.get('_primary_until', 0) > time.time():
+        return False
+    return True
+
+
+def read_from_replica(session, query_fn):
+    """
+    Run a read-only query on the replica, falling back to the primary
+
+    Args:
+        session: The database session (db.session)
+        query_fn (callable): Executes and returns the query result
+
+    Returns:
+        The result of query_fn
+    """
+    if not _use_replica(session):
+        return query_fn()
+
+    session.info['use_replica'] = True
+    try:
+        return query_fn()
+    except DBAPIError as e:
+        cooldown = current_app.config.get('REPLICA_RETRY_SECONDS', 30)
+        current_app.logger.warning(f"⚠️  Read replica failed, using primary for {cooldown}s: {e}")
+        replica_health.mark_failed(cooldown)
+        session.rollback()
+    finally:
+        session.info.pop('use_replica', None)
+
+    return query_fn()
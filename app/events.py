@@ -0,0 +1,206 @@
+"""
+Live forecast events for the Weather Forecast App
+In-process broadcast hub feeding /api/stream, with PostgreSQL LISTEN/NOTIFY
+fan-out so that every worker sees forecasts saved by the others
+"""
+import json
+import queue
+import select
+import threading
+import time
+from sqlalchemy import text
+from .models import db, WeatherLog
+
+NOTIFY_CHANNEL = 'forecast_saved'
+
+
+def _normalize_city(city):
+    return " ".join((city or "").split()).lower()
+
+
+class Subscription:
+    """One connected stream client with its own bounded event queue"""
+
+    def __init__(self, user_name=None, city=None, max_queue=100):
+        self.user_name = user_name or None
+        self.city = _normalize_city(city) or None
+        self.dropped = False
+        self._queue = queue.Queue(maxsize=max_queue)
+
+    def matches(self, event):
+        """True when an event passes this client's user_name/city filters"""
+        if self.user_name and event.get('user_name') != self.user_name:
+            return False
+        if self.city and _normalize_city(event.get('city')) != self.city:
+            return False
+        return True
+
+    def offer(self, frame):
+        """Queue a frame, dropping the client if it has fallen too far behind"""
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            self.dropped = True
+
+    def next_frame(self, timeout):
+        """Wait for the next frame, returning None on timeout"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class BroadcastHub:
+    """Fans saved forecasts out to every connected stream client in this process"""
+
+    def __init__(self):
+        self.app = None
+        self.max_connections = 4
+        self.max_queue = 100
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._listener = None
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        """Configure limits and start the LISTEN thread on PostgreSQL"""
+        self.app = app
+        self.max_connections = app.config.get('SSE_MAX_CONNECTIONS', self.max_connections)
+        self.max_queue = app.config.get('SSE_CLIENT_QUEUE_SIZE', self.max_queue)
+        app.extensions['broadcast_hub'] = self
+
+        if not app.config.get('SSE_PG_NOTIFY') or app.config.get('TESTING'):
+            return
+        with app.app_context():
+            if db.engine.dialect.name != 'postgresql':
+                return
+        self._stop.clear()
+        self._listener = threading.Thread(target=self._listen, name="forecast-listener", daemon=True)
+        self._listener.start()
+
+    @property
+    def uses_notify(self):
+        """True when events travel through PostgreSQL NOTIFY"""
+        return self._listener is not None
+
+    def subscribe(self, user_name=None, city=None):
+        """
+        Register a stream client
+
+        Returns:
+            Subscription: The new subscription, or None when at SSE_MAX_CONNECTIONS
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_connections:
+                return None
+            subscription = Subscription(user_name, city, self.max_queue)
+            self._subscribers.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a stream client"""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event):
+        """Render an event once and queue it for every matching client"""
+        with self._lock:
+            subscribers = [sub for sub in self._subscribers if sub.matches(event)]
+        if not subscribers:
+            return
+        frame = f"id: {event['id']}\nevent: forecast\ndata: {self.app.json.dumps(event)}\n\n"
+        for subscription in subscribers:
+            subscription.offer(frame)
+
+    def announce(self, weather_log):
+        """
+        Announce a committed forecast to stream clients
+
+        On PostgreSQL this sends one NOTIFY carrying the row ID, which every
+        worker's listener turns into a single read and local broadcast.
+        Otherwise the forecast is published to this process directly.
+        """
+        try:
+            if not self.uses_notify:
+                with self._lock:
+                    # No clients: skip reloading the just-committed row
+                    if not self._subscribers:
+                        return
+                self.publish(weather_log.to_dict())
+                return
+            db.session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": NOTIFY_CHANNEL, "payload": json.dumps({"id": weather_log.id})}
+            )
+            db.session.commit()
+        except Exception as e:
+            # The forecast is already saved; a missed live update is not an error for the user
+            db.session.rollback()
+            self.app.logger.error(f"Forecast announce failed: {e}")
+
+    def stats(self):
+        """Return a snapshot of hub state"""
+        with self._lock:
+            connected = len(self._subscribers)
+        return {
+            "connected": connected,
+            "max_connections": self.max_connections,
+            "pg_notify": self.uses_notify,
+        }
+
+    def _publish_ids(self, ids):
+        with self._lock:
+            # No clients in this worker: skip the read
+            if not self._subscribers:
+                return
+        with self.app.app_context():
+            try:
+                logs = WeatherLog.query.filter(WeatherLog.id.in_(ids)).all()
+                for log in logs:
+                    self.publish(log.to_dict())
+            finally:
+                db.session.remove()
+
+    def _listen(self):
+        """
+        LISTEN for saved forecasts on a dedicated connection, reconnecting on failure
+
+        Uses psycopg2's poll()/notifies API, the default driver for postgresql:// URLs.
+        """
+        backoff = 1
+        while not self._stop.is_set():
+            conn = None
+            try:
+                with self.app.app_context():
+                    raw = db.engine.raw_connection()
+                # Keep the connection out of the pool for the life of the listener
+                raw.detach()
+                conn = raw.driver_connection
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self.app.logger.info("✅ Listening for saved forecasts")
+                backoff = 1
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    ids = []
+                    while conn.notifies:
+                        notification = conn.notifies.pop(0)
+                        ids.append(json.loads(notification.payload)['id'])
+                    if ids:
+                        self._publish_ids(ids)
+            except Exception as e:
+                self.app.logger.error(f"Forecast listener error, reconnecting in {backoff}s: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+broadcast_hub = BroadcastHub()
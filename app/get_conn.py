@@ -5,10 +5,13 @@ import urllib.parse
 import os
 
 
-def get_connection_uri():
+def get_connection_uri(host=None):
     """
     Get Azure PostgreSQL connection URI with password authentication
     
+    Args:
+        host (str): Server to connect to instead of DBHOST (e.g. a read replica)
+    
     Required environment variables:
     - DBHOST: Azure PostgreSQL server name (e.g., myserver.postgres.database.azure.com)
     - DBNAME: Database name (e.g., postgres)
@@ -19,7 +22,7 @@ def get_connection_uri():
     Returns:
         str: PostgreSQL connection URI
     """
-    dbhost = os.environ.get('DBHOST')
+    dbhost = host or os.environ.get('DBHOST')
     dbname = os.environ.get('DBNAME', 'postgres')
     dbuser = urllib.parse.quote(os.environ.get('DBUSER', ''))
     password = os.environ.get('DBPASSWORD')
@@ -0,0 +1,77 @@
+"""
+Fast JSON provider for the Weather Forecast App
+Uses orjson when it is installed and falls back to Flask's stdlib provider
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+# dumps() keyword arguments orjson can honour; anything else goes to the stdlib
+_ORJSON_KWARGS = {'default', 'sort_keys', 'ensure_ascii', 'indent', 'separators'}
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson with the same output semantics as Flask's default
+
+    Dates and datetimes are passed through to Flask's default handler so they
+    keep serializing as RFC 822 strings, keys stay sorted, and responses stay
+    compact outside debug mode. orjson always emits UTF-8 rather than ASCII
+    escapes, which decodes to the same values. Values orjson rejects (e.g.
+    integers wider than 64 bits or non-string keys) are retried with the stdlib.
+    """
+
+    def _orjson_option(self, sort_keys, indent):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _can_use_orjson(self, kwargs):
+        if not ORJSON_AVAILABLE or not set(kwargs) <= _ORJSON_KWARGS:
+            return False
+        return kwargs.get('indent') in (None, 2)
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON to a string"""
+        if not self._can_use_orjson(kwargs):
+            return super().dumps(obj, **kwargs)
+        option = self._orjson_option(
+            kwargs.get('sort_keys', self.sort_keys),
+            kwargs.get('indent')
+        )
+        try:
+            return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON from a string or bytes"""
+        if not ORJSON_AVAILABLE or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize the given arguments as a JSON response without an intermediate str"""
+        if not ORJSON_AVAILABLE:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = orjson.dumps(
+                obj,
+                default=self.default,
+                option=self._orjson_option(self.sort_keys, indent) | orjson.OPT_APPEND_NEWLINE
+            )
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
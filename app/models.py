@@ -1,10 +1,43 @@
 """
 Database models for the Weather Forecast App
 """
+import hashlib
+import json
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from .db_routing import RoutingSession, read_from_replica
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+class ForecastPayload(db.Model):
+    """Forecast JSON stored once, keyed by the SHA-256 of its canonical form"""
+    __tablename__ = "forecast_payloads"
+    
+    hash = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ForecastPayload {self.hash[:12]}>'
+
+    @staticmethod
+    def canonical_json(data):
+        """Serialize forecast data with sorted keys and no insignificant whitespace"""
+        return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    @classmethod
+    def hash_data(cls, data):
+        """Content hash of forecast data"""
+        return hashlib.sha256(cls.canonical_json(data).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def for_data(cls, data):
+        """Get the stored payload for this data, or a new unsaved one"""
+        key = cls.hash_data(data)
+        return db.session.get(cls, key) or cls(hash=key, data=data)
 
 
 class WeatherLog(db.Model):
@@ -14,12 +47,29 @@ class WeatherLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_name = db.Column(db.String(100), nullable=False, index=True)
     city = db.Column(db.String(100), nullable=False)
-    weather_data = db.Column(db.JSON, nullable=False)
+    # Inline JSON from before payload deduplication; NULL once migrated
+    legacy_weather_data = db.Column("weather_data", db.JSON(none_as_null=True), nullable=True)
+    payload_hash = db.Column(db.String(64), db.ForeignKey("forecast_payloads.hash"), index=True)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
+    # selectin loads each distinct payload once per result set
+    payload = db.relationship(ForecastPayload, lazy="selectin")
+
     def __repr__(self):
         return f'<WeatherLog {self.user_name} - {self.city} at {self.timestamp}>'
 
+    @property
+    def weather_data(self):
+        """Forecast data from the shared payload, or the legacy inline copy"""
+        if self.payload is not None:
+            return self.payload.data
+        return self.legacy_weather_data
+
+    @weather_data.setter
+    def weather_data(self, data):
+        self.payload = ForecastPayload.for_data(data)
+        self.legacy_weather_data = None
+
     def to_dict(self):
         """Convert model instance to dictionary"""
         return {
@@ -33,26 +83,131 @@ class WeatherLog(db.Model):
     @classmethod
     def get_recent_forecasts(cls, limit=10):
         """Get the most recent forecasts across all users"""
-        return cls.query.order_by(cls.timestamp.desc()).limit(limit).all()
+        return read_from_replica(
+            db.session,
+            lambda: cls.query.order_by(cls.timestamp.desc()).limit(limit).all()
+        )
 
     @classmethod
     def get_user_forecasts(cls, user_name, limit=5):
         """Get recent forecasts for a specific user"""
-        return (
+        return read_from_replica(db.session, lambda: (
             cls.query
             .filter(cls.user_name == user_name)
             .order_by(cls.timestamp.desc())
             .limit(limit)
             .all()
-        )
+        ))
+
+    @classmethod
+    def get_forecasts_page(cls, page, per_page):
+        """Get one page of forecasts across all users, newest first"""
+        return read_from_replica(db.session, lambda: (
+            cls.query
+            .order_by(cls.timestamp.desc())
+            .paginate(page=page, per_page=per_page, error_out=False)
+        ))
+
+    @classmethod
+    def get_user_names(cls):
+        """Get the distinct names of users who have saved forecasts"""
+        rows = read_from_replica(db.session, lambda: (
+            cls.query
+            .with_entities(cls.user_name)
+            .distinct()
+            .order_by(cls.user_name)
+            .all()
+        ))
+        return [row[0] for row in rows]
+
+    @classmethod
+    def get_city_activity(cls, since):
+        """
+        Get request counts and last request time per city since a given time
+
+        Returns:
+            list: (city, count, last_timestamp) tuples, city lower-cased
+        """
+        city = db.func.lower(db.func.trim(cls.city))
+        return read_from_replica(db.session, lambda: (
+            db.session.query(city, db.func.count(cls.id), db.func.max(cls.timestamp))
+            .filter(cls.timestamp >= since)
+            .group_by(city)
+            .all()
+        ))
 
     def save(self):
         """Save the current instance to database"""
-        try:
-            db.session.add(self)
-            db.session.commit()
-            return True
-        except Exception as e:
-            db.session.rollback()
-            print(f"❌ DB error: {e}")
-            return False
+        for attempt in range(2):
+            try:
+                db.session.add(self)
+                db.session.commit()
+                return True
+            except IntegrityError as e:
+                db.session.rollback()
+                if attempt == 0 and self.payload is not None:
+                    # Another request stored the same payload first; point at its row
+                    self.weather_data = self.payload.data
+                    continue
+                print(f"❌ DB error: {e}")
+                return False
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ DB error: {e}")
+                return False
+
+
+def ensure_payload_schema():
+    """
+    Bring an existing weather_logs table up to the deduplicated payload schema
+
+    Adds weather_logs.payload_hash and makes the legacy weather_data column
+    nullable. Run at startup after create_all(); safe to run more than once
+    and from several workers at the same time.
+
+    Raises:
+        RuntimeError: When weather_data is NOT NULL on a database other than
+                      PostgreSQL or SQLite, where saving would fail
+    """
+    columns = {column['name']: column for column in inspect(db.engine).get_columns('weather_logs')}
+    dialect = db.engine.dialect.name
+
+    if dialect == 'sqlite' and not columns['weather_data']['nullable']:
+        # SQLite cannot drop NOT NULL in place
+        _rebuild_sqlite_weather_logs(columns)
+        return
+
+    with db.engine.begin() as conn:
+        if 'payload_hash' not in columns:
+            if_not_exists = "IF NOT EXISTS " if dialect == 'postgresql' else ""
+            conn.execute(text(
+                f"ALTER TABLE weather_logs ADD COLUMN {if_not_exists}payload_hash VARCHAR(64) "
+                "REFERENCES forecast_payloads (hash)"
+            ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_weather_logs_payload_hash ON weather_logs (payload_hash)"
+        ))
+        if not columns['weather_data']['nullable']:
+            if dialect != 'postgresql':
+                raise RuntimeError(
+                    f"weather_logs.weather_data is NOT NULL and cannot be upgraded on {dialect}; "
+                    "saving forecasts would fail."
+                )
+            conn.execute(text("ALTER TABLE weather_logs ALTER COLUMN weather_data DROP NOT NULL"))
+
+
+def _rebuild_sqlite_weather_logs(columns):
+    """Recreate weather_logs with the current schema, keeping every row"""
+    copied = ", ".join(name for name in WeatherLog.__table__.columns.keys() if name in columns)
+    with db.engine.connect() as conn:
+        # pysqlite does not open a transaction for DDL; do it explicitly so the rebuild is atomic
+        conn.exec_driver_sql("BEGIN")
+        conn.exec_driver_sql("ALTER TABLE weather_logs RENAME TO weather_logs_old")
+        for index in inspect(conn).get_indexes('weather_logs_old'):
+            conn.exec_driver_sql(f"DROP INDEX {index['name']}")
+        WeatherLog.__table__.create(conn)
+        conn.exec_driver_sql(
+            f"INSERT INTO weather_logs ({copied}) SELECT {copied} FROM weather_logs_old"
+        )
+        conn.exec_driver_sql("DROP TABLE weather_logs_old")
+        conn.commit()
@@ -0,0 +1,126 @@
+"""
+Request profiling for the Weather Forecast App
+Opt-in sampled cProfile dumps, slow-query logging and Server-Timing headers
+"""
+import cProfile
+import os
+import random
+import time
+from contextlib import contextmanager
+from flask import (current_app, g, has_app_context, has_request_context, request,
+                   before_render_template, template_rendered)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def record_timing(name, seconds):
+    """Add time spent in a named phase to the current request's breakdown"""
+    if not has_request_context():
+        return
+    timings = g.setdefault('_server_timing', {})
+    total, count = timings.get(name, (0.0, 0))
+    timings[name] = (total + seconds, count + 1)
+
+
+@contextmanager
+def timed(name):
+    """Time a block and record it under name in the request breakdown"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    record_timing('db', elapsed)
+
+    if not has_app_context():
+        return
+    slow_ms = current_app.config.get('SLOW_QUERY_MS', 0)
+    if slow_ms and elapsed * 1000 >= slow_ms:
+        route = f"{request.method} {request.path} ({request.endpoint})" if has_request_context() else "background"
+        current_app.logger.warning(
+            f"🐢 Slow query {elapsed * 1000:.1f}ms in {route}: {' '.join(statement.split())}"
+        )
+
+
+def _before_render(sender, template, context, **extra):
+    g._render_start = time.perf_counter()
+
+
+def _after_render(sender, template, context, **extra):
+    start = g.pop('_render_start', None)
+    if start is not None:
+        record_timing('render', time.perf_counter() - start)
+
+
+def _start_request():
+    g._request_start = time.perf_counter()
+    config = current_app.config
+    if config.get('PROFILING_ENABLED') and random.random() < config.get('PROFILE_SAMPLE_RATE', 0.1):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            return
+        g._profiler = profiler
+
+
+def _finish_request(response):
+    start = g.get('_request_start')
+    if start is None:
+        return response
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    config = current_app.config
+
+    profiler = g.pop('_profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        if elapsed_ms >= config.get('PROFILE_THRESHOLD_MS', 500):
+            _dump_profile(profiler, elapsed_ms)
+
+    if config.get('SERVER_TIMING_ENABLED'):
+        metrics = [
+            f'{name};dur={total * 1000:.1f};desc="{count}x"'
+            for name, (total, count) in g.get('_server_timing', {}).items()
+        ]
+        metrics.append(f"total;dur={elapsed_ms:.1f}")
+        response.headers.add('Server-Timing', ", ".join(metrics))
+    return response
+
+
+def _dump_profile(profiler, elapsed_ms):
+    directory = current_app.config.get('PROFILE_DIR') or os.path.join(current_app.instance_path, 'profiles')
+    try:
+        os.makedirs(directory, exist_ok=True)
+        filename = f"{int(time.time() * 1000)}-{request.endpoint or 'unknown'}-{elapsed_ms:.0f}ms.prof"
+        profiler.dump_stats(os.path.join(directory, filename))
+        current_app.logger.info(f"📊 Profile saved for {request.method} {request.path} ({elapsed_ms:.0f}ms): {filename}")
+    except OSError as e:
+        current_app.logger.error(f"Profile dump failed: {e}")
+
+
+def init_profiling(app):
+    """Register profiling hooks for whichever profiling features are enabled"""
+    config = app.config
+    if not (config.get('PROFILING_ENABLED') or config.get('SLOW_QUERY_MS') or config.get('SERVER_TIMING_ENABLED')):
+        return
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
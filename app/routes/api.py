@@ -2,9 +2,14 @@
 API routes for the Weather Forecast App
 Handles JSON API endpoints
 """
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app
 from ..models import WeatherLog
 from ..utils import fetch_weather_data
+from ..cache import forecast_cache
+from ..warmer import cache_warmer
+from ..admission import AdmissionRejected, rate_limited, upstream_limiter
+from ..cities import city_catalog
+from ..events import broadcast_hub
 
 api_bp = Blueprint('api', __name__)
 
@@ -31,6 +36,7 @@ def recent_for_name():
 
 
 @api_bp.route("/weather", methods=["GET"])
+@rate_limited
 def get_weather():
     """
     Backend API to fetch weather data securely without exposing API key to frontend.
@@ -58,6 +64,24 @@ def get_weather():
     return jsonify({"list": forecasts})
 
 
+@api_bp.route("/cities", methods=["GET"])
+def search_cities():
+    """
+    City name autocomplete from the local city catalog
+    GET /api/cities?q=new%20yo&limit=10
+    """
+    query = (request.args.get("q") or "").strip()
+    limit = min(request.args.get("limit", 10, type=int), 20)
+    if not query or limit < 1:
+        return jsonify({"cities": []})
+    
+    cities = city_catalog.search(query, limit=limit)
+    response = jsonify({"cities": [city._asdict() for city in cities]})
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
+
+
 @api_bp.route("/users", methods=["GET"])
 def get_users():
     """
@@ -65,17 +89,7 @@ def get_users():
     GET /api/users
     """
     try:
-        # Get distinct user names from the database
-        users = (
-            WeatherLog.query
-            .with_entities(WeatherLog.user_name)
-            .distinct()
-            .order_by(WeatherLog.user_name)
-            .all()
-        )
-        
-        user_list = [user[0] for user in users]
-        return jsonify({"users": user_list})
+        return jsonify({"users": WeatherLog.get_user_names()})
         
     except Exception as e:
         current_app.logger.error(f"Error fetching users: {e}")
@@ -95,15 +109,7 @@ def get_all_forecasts():
         # Limit per_page to prevent abuse
         per_page = min(per_page, 50)
         
-        pagination = (
-            WeatherLog.query
-            .order_by(WeatherLog.timestamp.desc())
-            .paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-        )
+        pagination = WeatherLog.get_forecasts_page(page, per_page)
         
         return jsonify({
             "forecasts": [forecast.to_dict() for forecast in pagination.items],
@@ -120,6 +126,52 @@ def get_all_forecasts():
         return jsonify({"error": "Internal server error"}), 500
 
 
+@api_bp.route("/stream", methods=["GET"])
+def stream_forecasts():
+    """
+    Server-Sent Events stream of newly saved forecasts
+    GET /api/stream?user_name=Alice&city=London
+    """
+    subscription = broadcast_hub.subscribe(
+        user_name=(request.args.get("user_name") or "").strip(),
+        city=request.args.get("city")
+    )
+    if subscription is None:
+        raise AdmissionRejected("Too many live connections - please try again later", 503, 30)
+    
+    heartbeat = current_app.config.get('SSE_HEARTBEAT_SECONDS', 15)
+    
+    def events():
+        # Tell EventSource how long to wait before reconnecting
+        yield "retry: 5000\n\n"
+        while not subscription.dropped:
+            frame = subscription.next_frame(timeout=heartbeat)
+            # Comment lines keep proxies from closing idle connections
+            yield frame if frame is not None else ": heartbeat\n\n"
+    
+    response = Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    # Runs when the server closes the body, even if the generator never started (HEAD)
+    response.call_on_close(lambda: broadcast_hub.unsubscribe(subscription))
+    return response
+
+
+@api_bp.route("/cache/stats", methods=["GET"])
+def cache_stats():
+    """
+    Forecast cache and cache warmer metrics
+    GET /api/cache/stats
+    """
+    return jsonify({
+        "cache": forecast_cache.stats(),
+        "warmer": cache_warmer.stats(),
+        "upstream": upstream_limiter.stats()
+    })
+
+
 @api_bp.errorhandler(404)
 def api_not_found(error):
     """Handle 404 errors for API routes"""
@@ -7,11 +7,15 @@ from datetime import datetime
 from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
 from ..models import WeatherLog, db
 from ..utils import fetch_weather_data, validate_weather_data
+from ..admission import rate_limited
+from ..db_routing import pin_primary
+from ..events import broadcast_hub
 
 weather_bp = Blueprint('weather', __name__)
 
 
 @weather_bp.route("/get_weather", methods=["POST"])
+@rate_limited
 def get_weather():
     """Fetch weather data and display results"""
     user_name = (request.form.get("user_name") or "").strip()
@@ -95,8 +99,11 @@ def save_forecast():
         )
         
         if weather_log.save():
+            # Read-your-writes: the redirect must not hit a lagging replica
+            pin_primary()
             flash(f"Weather forecast for {city} saved successfully!", "success")
             current_app.logger.info(f"✅ Saved: user={user_name} city={city}")
+            broadcast_hub.announce(weather_log)
         else:
             flash("Failed to save forecast: database error.", "error")
             
@@ -3,6 +3,10 @@ Utility functions for the Weather Forecast App
 """
 import requests
 from flask import current_app
+from .cache import forecast_cache
+from .admission import upstream_limiter
+from .cities import city_catalog
+from .profiling import timed
 
 
 class WeatherAPIError(Exception):
@@ -10,19 +14,21 @@ class WeatherAPIError(Exception):
     pass
 
 
-def fetch_weather_data(city, timeout=10):
+def fetch_weather_data(city, timeout=10, refresh=False, source='user'):
     """
-    Fetch weather data from OpenWeather API
+    Fetch weather data from OpenWeather API, served from the forecast cache when fresh
     
     Args:
         city (str): Name of the city
         timeout (int): Request timeout in seconds
+        refresh (bool): Skip the cache lookup and always call the API
+        source (str): Who is filling the cache ('user' or 'warmer')
         
     Returns:
         tuple: (forecasts_list, error_message)
         
     Raises:
-        WeatherAPIError: When API request fails
+        AdmissionRejected: When the upstream concurrency limit is saturated
     """
     api_key = current_app.config.get('OPENWEATHER_API_KEY')
     
@@ -32,16 +38,75 @@ def fetch_weather_data(city, timeout=10):
     if not city or not city.strip():
         return None, "City name is required"
     
+    cache_key, query = resolve_forecast_query(city)
+    if query is None:
+        # Unknown to the local city catalog: no need to ask OpenWeather
+        return None, "city not found"
+    
+    if not refresh:
+        cached = forecast_cache.get(cache_key)
+        if cached is not None:
+            return cached, None
+    
+    # Raises AdmissionRejected when too many upstream calls are in flight
+    with upstream_limiter.slot():
+        forecasts, error = _request_forecasts(query, api_key, timeout)
+    if forecasts:
+        forecast_cache.set(cache_key, forecasts, source=source)
+    return forecasts, error
+
+
+def resolve_forecast_query(city):
+    """
+    Map a user-entered city to its forecast cache key and API query
+    
+    When a city catalog is loaded, names that identify exactly one city
+    resolve to OpenWeather city IDs so that different spellings share a cache
+    entry. Ambiguous names, or qualifiers the catalog can't match (e.g.
+    "London, UK"), are left for OpenWeather to resolve by name. Only names
+    absent from the catalog are rejected.
+    
+    Args:
+        city (str): Name of the city as entered by the user
+        
+    Returns:
+        tuple: (cache_key, query_params), query_params is None for unknown cities
+    """
+    if not city_catalog.loaded:
+        return forecast_cache.make_key(city), {'q': city.strip()}
+    
+    match = city_catalog.resolve(city)
+    if match is not None:
+        return f"id:{match.id}", {'id': match.id}
+    if city_catalog.knows(city):
+        query = city_catalog.expand_alias(city).strip()
+        return forecast_cache.make_key(query), {'q': query}
+    return None, None
+
+
+def _request_forecasts(query, api_key, timeout):
+    """
+    Call the OpenWeather forecast API and reduce the result to daily forecasts
+    
+    Args:
+        query (dict): City selector, either {'q': name} or {'id': city_id}
+        api_key (str): OpenWeather API key
+        timeout (int): Request timeout in seconds
+    
+    Returns:
+        tuple: (forecasts_list, error_message)
+    """
     try:
         url = f"https://api.openweathermap.org/data/2.5/forecast"
         params = {
-            'q': city.strip(),
+            **query,
             'appid': api_key,
             'units': 'metric'
         }
         
-        response = requests.get(url, params=params, timeout=timeout)
-        data = response.json()
+        with timed('upstream'):
+            response = requests.get(url, params=params, timeout=timeout)
+            data = response.json()
         
         if response.status_code != 200 or data.get('cod') != '200':
             error_msg = data.get('message', 'City not found or API error')
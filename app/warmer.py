@@ -0,0 +1,141 @@
+"""
+Predictive cache warming for the Weather Forecast App
+Keeps forecasts for the most requested cities fresh before they expire
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from .admission import AdmissionRejected
+from .cache import forecast_cache
+from .models import WeatherLog
+from .utils import fetch_weather_data, resolve_forecast_query
+
+
+class CallBudget:
+    """Sliding one-minute window limiting upstream calls"""
+
+    def __init__(self, calls_per_minute):
+        self.calls_per_minute = calls_per_minute
+        self._calls = deque()
+
+    def try_spend(self):
+        """Consume one call from the budget, returning False when exhausted"""
+        now = time.monotonic()
+        while self._calls and now - self._calls[0] >= 60:
+            self._calls.popleft()
+        if len(self._calls) >= self.calls_per_minute:
+            return False
+        self._calls.append(now)
+        return True
+
+
+class CacheWarmer:
+    """Background thread refreshing popular cities' forecasts ahead of expiry"""
+
+    def __init__(self):
+        self.app = None
+        self.budget = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._stats = {
+            'runs': 0,
+            'refreshed': 0,
+            'failed': 0,
+            'skipped_budget': 0,
+            'skipped_capacity': 0,
+            'last_run': None,
+            'top_cities': [],
+        }
+
+    def init_app(self, app):
+        """Configure the warmer and start it when enabled"""
+        self.app = app
+        self.budget = CallBudget(app.config.get('CACHE_WARM_CALLS_PER_MINUTE', 20))
+        app.extensions['cache_warmer'] = self
+        if app.config.get('CACHE_WARMING_ENABLED') and not app.config.get('TESTING'):
+            self.start()
+
+    def start(self):
+        """Start the background warming thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Signal the background thread to stop"""
+        self._stop.set()
+
+    def _run(self):
+        interval = self.app.config.get('CACHE_WARM_INTERVAL', 30)
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    self.warm_once()
+            except Exception as e:
+                self.app.logger.error(f"Cache warmer error: {e}")
+            self._stop.wait(interval)
+
+    def rank_cities(self):
+        """
+        Rank cities by request history, most popular first
+
+        Each city scores its request count weighted down by how long ago it
+        was last requested, so recent interest outranks stale volume.
+
+        Returns:
+            list: City names, at most CACHE_WARM_TOP_N entries
+        """
+        config = self.app.config
+        window = timedelta(hours=config.get('CACHE_WARM_HISTORY_HOURS', 24))
+        now = datetime.utcnow()
+        scored = []
+        for city, count, last_seen in WeatherLog.get_city_activity(now - window):
+            if not city:
+                continue
+            age_hours = max(0.0, (now - last_seen).total_seconds() / 3600)
+            scored.append((count / (1 + age_hours), city))
+        scored.sort(reverse=True)
+        return [city for _, city in scored[:config.get('CACHE_WARM_TOP_N', 10)]]
+
+    def warm_once(self):
+        """Refresh every top-ranked city whose cached forecast is about to expire"""
+        config = self.app.config
+        lead = config.get('CACHE_WARM_LEAD_SECONDS', 60)
+        timeout = config.get('WEATHER_API_TIMEOUT', 10)
+        cities = self.rank_cities()
+        self._stats['runs'] += 1
+        self._stats['last_run'] = datetime.utcnow().isoformat()
+        self._stats['top_cities'] = cities
+
+        for city in cities:
+            cache_key, query = resolve_forecast_query(city)
+            if query is None or forecast_cache.expires_in(cache_key) > lead:
+                continue
+            if not self.budget.try_spend():
+                self._stats['skipped_budget'] += 1
+                continue
+            try:
+                forecasts, error = fetch_weather_data(
+                    city, timeout=timeout, refresh=True, source='warmer'
+                )
+            except AdmissionRejected:
+                # Upstream is saturated by user traffic; stop for this round
+                self._stats['skipped_capacity'] += 1
+                break
+            if error:
+                self._stats['failed'] += 1
+                self.app.logger.warning(f"Cache warm failed for {city}: {error}")
+            else:
+                self._stats['refreshed'] += 1
+
+    def stats(self):
+        """Return a snapshot of warmer counters"""
+        stats = dict(self._stats)
+        stats['running'] = self._thread is not None and self._thread.is_alive()
+        return stats
+
+
+cache_warmer = CacheWarmer()
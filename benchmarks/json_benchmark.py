@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization and compression for typical API payloads
+
+Compares Flask's stdlib JSON provider against FastJSONProvider and reports
+bytes on the wire raw, gzipped and (when installed) Brotli-compressed.
+
+Usage:
+    python benchmarks/json_benchmark.py [iterations]
+"""
+import gzip
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('FLASK_ENV', 'development')
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.config import Config
+from app.json_provider import FastJSONProvider, ORJSON_AVAILABLE
+from app.compression import BROTLI_AVAILABLE, brotli
+
+CITIES = ["London", "Paris", "Tel Aviv", "New York", "Tokyo", "Berlin", "Sydney", "Toronto"]
+CONDITIONS = [
+    (800, "Clear", "clear sky", "01d"),
+    (802, "Clouds", "scattered clouds", "03d"),
+    (803, "Clouds", "broken clouds", "04d"),
+    (500, "Rain", "light rain", "10d"),
+    (600, "Snow", "light snow", "13d"),
+]
+
+# Fixed seed: varied payloads, but the same ones on every run
+rng = random.Random(42)
+
+
+def make_forecast(start, day, base_temp, hour=12):
+    """Build one forecast item shaped like fetch_weather_data output"""
+    dt = start + timedelta(days=day, hours=hour)
+    temp = round(base_temp + rng.uniform(-4, 4), 2)
+    low, high = round(temp - rng.uniform(1, 5), 2), round(temp + rng.uniform(1, 5), 2)
+    weather_id, main, description, icon = rng.choice(CONDITIONS)
+    return {
+        "dt": int(dt.timestamp()),
+        "dt_txt": dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "main": {
+            "temp": temp, "feels_like": round(temp - rng.uniform(0, 3), 2),
+            "temp_min": low, "temp_max": high,
+            "pressure": rng.randint(990, 1035), "sea_level": rng.randint(990, 1035),
+            "grnd_level": rng.randint(980, 1030),
+            "humidity": rng.randint(30, 100), "temp_kf": 0.0
+        },
+        "weather": [{"id": weather_id, "main": main, "description": description, "icon": icon}],
+        "clouds": {"all": rng.randint(0, 100)},
+        "wind": {
+            "speed": round(rng.uniform(0, 12), 2), "deg": rng.randint(0, 359),
+            "gust": round(rng.uniform(0, 18), 2)
+        },
+        "visibility": rng.choice([10000, 10000, 8000, 5000]),
+        "pop": round(rng.random(), 2),
+        "sys": {"pod": "d"},
+        "daily_temps": {"min": low, "max": high, "current": temp}
+    }
+
+
+def make_forecasts(days=5):
+    """Build a forecast list for a random start date and climate"""
+    start = datetime(2025, 1, 1) + timedelta(days=rng.randint(0, 364))
+    base_temp = rng.uniform(-5, 30)
+    return [make_forecast(start, day, base_temp) for day in range(days)]
+
+
+def make_saved_forecast(i):
+    """Build one WeatherLog.to_dict() shaped record"""
+    saved = datetime(2025, 1, 1) + timedelta(minutes=rng.randint(0, 525600))
+    return {
+        "id": i,
+        "user_name": f"user{i % 7}",
+        "city": rng.choice(CITIES),
+        "weather_data": make_forecasts(rng.randint(1, 5)),
+        "timestamp": saved.strftime("%Y-%m-%d %H:%M")
+    }
+
+
+PAYLOADS = {
+    "/api/weather": {"list": make_forecasts()},
+    "/api/recent": [make_saved_forecast(i) for i in range(5)],
+    "/api/forecasts (50)": {
+        "forecasts": [make_saved_forecast(i) for i in range(50)],
+        "total": 500, "pages": 10, "current_page": 1, "per_page": 50,
+        "has_next": True, "has_prev": False,
+        "generated": datetime(2025, 1, 1, 12, 0)
+    },
+}
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = Flask(__name__)
+    providers = {"stdlib": DefaultJSONProvider(app), "fast": FastJSONProvider(app)}
+
+    print(f"orjson available: {ORJSON_AVAILABLE}, brotli available: {BROTLI_AVAILABLE}")
+    print(f"{'payload':<22}{'provider':<10}{'us/op':>10}{'raw B':>10}{'gzip B':>10}{'br B':>10}")
+
+    with app.app_context():
+        for name, payload in PAYLOADS.items():
+            for label, provider in providers.items():
+                seconds = timeit.timeit(lambda: provider.response(payload), number=iterations)
+                body = provider.response(payload).get_data()
+                gzipped = len(gzip.compress(body, compresslevel=Config.COMPRESS_LEVEL))
+                brotlied = (len(brotli.compress(body, quality=Config.COMPRESS_BR_LEVEL))
+                            if BROTLI_AVAILABLE else "-")
+                print(f"{name:<22}{label:<10}{seconds / iterations * 1e6:>10.1f}"
+                      f"{len(body):>10}{gzipped:>10}{brotlied:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -174,6 +174,9 @@ resource "azurerm_linux_web_app" "main" {
     # API Configuration
     "OPENWEATHER_API_KEY" = var.openweather_api_key
     
+    # Lets the app trust X-Azure-ClientIP on requests from this Front Door profile
+    "FRONT_DOOR_ID" = var.enable_front_door ? azurerm_cdn_frontdoor_profile.main[0].resource_guid : ""
+    
     # Python Configuration
     "PYTHONPATH" = "/home/site/wwwroot"
     "SCM_DO_BUILD_DURING_DEPLOYMENT" = "true"